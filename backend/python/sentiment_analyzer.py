@@ -3,17 +3,85 @@
 VADER Sentiment Analysis Script with Mental Health Context
 """
 
+import os
+import re
 import sys
 import json
+import pickle
+
+# Results carry emoji and orjson emits them raw (it has no ensure_ascii),
+# so force UTF-8 on stdout - a piped stdout on Windows otherwise defaults
+# to the ANSI codepage and the write raises UnicodeEncodeError
+if hasattr(sys.stdout, 'reconfigure'):
+    sys.stdout.reconfigure(encoding='utf-8')
 
 try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj).decode()
+
+    _loads = orjson.loads
+except ImportError:
+    # orjson is an optional speedup; stdlib json works the same
+    _dumps = json.dumps
+    _loads = json.loads
+
+try:
+    from vaderSentiment import vaderSentiment as _vader
     from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 except ImportError:
-    print(json.dumps({
+    print(_dumps({
         "error": "vaderSentiment not installed. Run: pip install vaderSentiment"
     }))
     sys.exit(1)
 
+_ORIG_MAKE_LEX_DICT = SentimentIntensityAnalyzer.make_lex_dict
+
+def _cached_make_lex_dict(self):
+    """
+    make_lex_dict with a pickle cache next to vader_lexicon.txt.
+    Unpickling the parsed dict is much faster than tab-splitting and
+    float-parsing ~7500 lexicon lines on every process start.
+    """
+    pkl = os.path.join(os.path.dirname(os.path.abspath(_vader.__file__)),
+                       'vader_lexicon.pkl')
+    try:
+        with open(pkl, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+
+    lex_dict = _ORIG_MAKE_LEX_DICT(self)
+    try:
+        with open(pkl, 'wb') as f:
+            pickle.dump(lex_dict, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        # Site-packages may be read-only; parsing still works without it
+        pass
+    return lex_dict
+
+SentimentIntensityAnalyzer.make_lex_dict = _cached_make_lex_dict
+
+try:
+    import ahocorasick
+except ImportError:
+    # Optional speedup - without it we fall back to per-keyword scans
+    ahocorasick = None
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    # Optional speedup for analyze_batch - without it we fall back to
+    # per-text analyze_sentiment calls
+    np = None
+    njit = None
+
+# Shared analyzer instance - building it parses the full VADER lexicon
+# (~7500 entries), so do it once at import instead of on every call
+_ANALYZER = SentimentIntensityAnalyzer()
+
 # Mental health keyword adjustments
 MENTAL_HEALTH_KEYWORDS = {
     # Negative mental health terms that VADER might underestimate
@@ -43,67 +111,124 @@ MENTAL_HEALTH_KEYWORDS = {
     'proud': 0.2,
 }
 
+# Parallel key/weight tuples for the fallback scan - interned keys and no
+# dict .items() view allocation inside the hot loop
+_MH_KEYS = tuple(sys.intern(k) for k in MENTAL_HEALTH_KEYWORDS)
+_MH_WEIGHTS = tuple(MENTAL_HEALTH_KEYWORDS.values())
+
 # Sarcasm indicators
-SARCASM_INDICATORS = [
+SARCASM_INDICATORS = (
     'yeah right', 'oh great', 'just what i needed', 'perfect',
     'wonderful', 'fantastic', 'brilliant', 'amazing'
-]
+)
+
+# Negative context words that turn a sarcasm indicator into actual sarcasm
+NEGATIVE_CONTEXT = ('another', 'just', 'oh', 'yeah', 'sure')
+
+# Emoji sarcasm indicators - a codepoint set so one character walk with
+# O(1) membership replaces a substring scan per emoji
+SARCASM_EMOJIS = frozenset('🙄😒🤦🤷😑')
+
+# Precompiled alternations so detect_sarcasm does two linear scans
+# instead of one substring search per indicator/context word
+_INDICATOR_RE = re.compile('|'.join(re.escape(i) for i in SARCASM_INDICATORS))
+_CONTEXT_RE = re.compile('|'.join(re.escape(w) for w in NEGATIVE_CONTEXT))
+
+# Match kinds for the combined keyword automaton
+_KIND_MENTAL_HEALTH = 0
+_KIND_SARCASM = 1
+_KIND_CONTEXT = 2
+
+if ahocorasick is not None:
+    # One automaton holding every keyword we scan for, so a single linear
+    # pass over the text replaces a substring search per keyword
+    _AC = ahocorasick.Automaton()
+    for _keyword, _weight in MENTAL_HEALTH_KEYWORDS.items():
+        _AC.add_word(_keyword, (_KIND_MENTAL_HEALTH, _keyword, _weight))
+    for _indicator in SARCASM_INDICATORS:
+        _AC.add_word(_indicator, (_KIND_SARCASM, _indicator, 0.0))
+    for _word in NEGATIVE_CONTEXT:
+        _AC.add_word(_word, (_KIND_CONTEXT, _word, 0.0))
+    _AC.make_automaton()
+else:
+    _AC = None
 
-def detect_sarcasm(text):
+def _scan(text_lower):
     """
-    Simple sarcasm detection based on common patterns
+    Combined sarcasm + mental health scan in a single pass over the text.
+    Returns (sarcasm_detected, mental_health_adjustment).
     """
-    text_lower = text.lower()
-    
-    # Check for sarcasm indicators
-    for indicator in SARCASM_INDICATORS:
-        if indicator in text_lower:
-            # Check for negative context words nearby
-            negative_context = ['another', 'just', 'oh', 'yeah', 'sure']
-            if any(word in text_lower for word in negative_context):
-                return True
-    
-    # Check for emoji sarcasm indicators
-    sarcasm_emojis = ['🙄', '😒', '🤦', '🤷', '😑']
-    if any(emoji in text for emoji in sarcasm_emojis):
-        return True
-    
-    return False
+    if _AC is None:
+        return detect_sarcasm(text_lower), _keyword_adjustment(text_lower)
 
-def adjust_for_mental_health(text, base_compound):
+    adjustment = 0.0
+    seen = set()
+    has_indicator = False
+    has_context = False
+    for _, (kind, keyword, weight) in _AC.iter(text_lower):
+        if kind == _KIND_MENTAL_HEALTH:
+            # Each keyword counts once
+            if keyword not in seen:
+                seen.add(keyword)
+                adjustment += weight
+        elif kind == _KIND_SARCASM:
+            has_indicator = True
+        else:
+            has_context = True
+
+    sarcasm = (has_indicator and has_context) or \
+        not SARCASM_EMOJIS.isdisjoint(text_lower)
+
+    # Apply adjustment (max ±0.3)
+    return sarcasm, max(-0.3, min(0.3, adjustment))
+
+def _keyword_adjustment(text_lower):
     """
-    Adjust sentiment score based on mental health context
+    Sum mental health keyword weights, clamped to ±0.3
     """
-    text_lower = text.lower()
     adjustment = 0.0
-    
-    # Count mental health keywords
-    for keyword, weight in MENTAL_HEALTH_KEYWORDS.items():
+    for keyword, weight in zip(_MH_KEYS, _MH_WEIGHTS):
         if keyword in text_lower:
             adjustment += weight
-    
-    # Apply adjustment (max ±0.3)
-    adjustment = max(-0.3, min(0.3, adjustment))
-    
-    return base_compound + adjustment
+    return max(-0.3, min(0.3, adjustment))
+
+def detect_sarcasm(text_lower):
+    """
+    Simple sarcasm detection based on common patterns.
+    Expects already-lowercased text so callers lowercase only once.
+    """
+    # An indicator plus a negative context word, or a sarcasm emoji
+    return bool(_INDICATOR_RE.search(text_lower)
+                and _CONTEXT_RE.search(text_lower)) \
+        or not SARCASM_EMOJIS.isdisjoint(text_lower)
+
+def adjust_for_mental_health(text_lower, base_compound):
+    """
+    Adjust sentiment score based on mental health context.
+    Expects already-lowercased text so callers lowercase only once.
+    """
+    return base_compound + _keyword_adjustment(text_lower)
 
 def analyze_sentiment(text):
     """
     Enhanced sentiment analysis with context awareness
     """
-    analyzer = SentimentIntensityAnalyzer()
-    scores = analyzer.polarity_scores(text)
-    
+    scores = _ANALYZER.polarity_scores(text)
+
     # Get base compound score
     compound = scores['compound']
-    
+
+    # Lowercase once and scan once for sarcasm + mental health context
+    text_lower = text.lower()
+    sarcasm, mh_adjustment = _scan(text_lower)
+
     # Check for sarcasm (flip positive to negative)
-    if detect_sarcasm(text) and compound > 0:
+    if sarcasm and compound > 0:
         compound = -abs(compound) * 0.7  # Flip and dampen
-    
+
     # Apply mental health context adjustments
-    compound = adjust_for_mental_health(text, compound)
-    
+    compound += mh_adjustment
+
     # Ensure compound stays in valid range
     compound = max(-1.0, min(1.0, compound))
     
@@ -127,19 +252,117 @@ def analyze_sentiment(text):
         "label": label,
         "emoji": emoji,
         "adjustments": {
-            "sarcasm_detected": detect_sarcasm(text),
+            "sarcasm_detected": sarcasm,
             "mental_health_context": True
         }
     }
     
     return result
 
+# Label/emoji lookup indexed by label code + 1 (-1/0/1 -> Negative/Neutral/Positive)
+_LABELS = (
+    ("Negative", "😔"),
+    ("Neutral", "😐"),
+    ("Positive", "😊"),
+)
+
+if njit is not None:
+    @njit(cache=True)
+    def _finalize(comp, mh, sarc):
+        """
+        Apply sarcasm flip, mental health adjustment, and clamping for a
+        whole batch; returns adjusted compounds and int8 label codes.
+        """
+        n = comp.shape[0]
+        out = np.empty(n, dtype=np.float64)
+        codes = np.empty(n, dtype=np.int8)
+        for i in range(n):
+            c = comp[i]
+            if sarc[i] and c > 0.0:
+                c = -abs(c) * 0.7
+            c += mh[i]
+            if c > 1.0:
+                c = 1.0
+            elif c < -1.0:
+                c = -1.0
+            out[i] = c
+            if c >= 0.05:
+                codes[i] = 1
+            elif c <= -0.05:
+                codes[i] = -1
+            else:
+                codes[i] = 0
+        return out, codes
+
+def analyze_batch(texts):
+    """
+    Analyze a batch of texts (e.g. a day's worth of journal entries).
+    VADER still scores each text individually, but the per-element
+    adjustment math runs in a compiled kernel when numba is available.
+    """
+    if njit is None:
+        return [analyze_sentiment(text) for text in texts]
+
+    n = len(texts)
+    scores = [_ANALYZER.polarity_scores(text) for text in texts]
+    comp = np.empty(n, dtype=np.float64)
+    mh = np.empty(n, dtype=np.float64)
+    sarc = np.empty(n, dtype=np.bool_)
+    for i, text in enumerate(texts):
+        comp[i] = scores[i]['compound']
+        sarc[i], mh[i] = _scan(text.lower())
+
+    adjusted, codes = _finalize(comp, mh, sarc)
+
+    results = []
+    for i in range(n):
+        label, emoji = _LABELS[codes[i] + 1]
+        results.append({
+            "positive": round(scores[i]['pos'], 3),
+            "neutral": round(scores[i]['neu'], 3),
+            "negative": round(scores[i]['neg'], 3),
+            "compound": round(float(adjusted[i]), 3),
+            "label": label,
+            "emoji": emoji,
+            "adjustments": {
+                "sarcasm_detected": bool(sarc[i]),
+                "mental_health_context": True
+            }
+        })
+    return results
+
+def run_server():
+    """
+    JSON-line server mode: one {"text": ...} request per stdin line, one
+    JSON response per stdout line. Lets the backend keep a single worker
+    process alive instead of paying interpreter + import startup per call.
+    """
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = _loads(line)
+            text = request.get('text', '')
+            if not text or len(text.strip()) == 0:
+                response = {"error": "Empty text provided"}
+            else:
+                response = analyze_sentiment(text)
+        except Exception as e:
+            response = {"error": f"Analysis failed: {str(e)}"}
+        sys.stdout.write(_dumps(response) + '\n')
+        sys.stdout.flush()
+
 def main():
     """
     Main function - reads text from command line argument
     """
+    if len(sys.argv) > 1 and sys.argv[1] == '--server':
+        run_server()
+        return
+
     if len(sys.argv) < 2:
-        print(json.dumps({
+        print(_dumps({
             "error": "No text provided for analysis"
         }))
         sys.exit(1)
@@ -147,17 +370,17 @@ def main():
     text = sys.argv[1]
     
     if not text or len(text.strip()) == 0:
-        print(json.dumps({
+        print(_dumps({
             "error": "Empty text provided"
         }))
         sys.exit(1)
     
     try:
         sentiment = analyze_sentiment(text)
-        print(json.dumps(sentiment))
+        print(_dumps(sentiment))
         sys.exit(0)
     except Exception as e:
-        print(json.dumps({
+        print(_dumps({
             "error": f"Analysis failed: {str(e)}"
         }))
         sys.exit(1)
@@ -6,6 +6,27 @@ Supports male/female voices and speech speed control
 
 import sys
 import os
+import json
+import hashlib
+import shutil
+
+# Server responses may carry non-ASCII text (paths, error messages) and
+# orjson emits it raw (no ensure_ascii), so force UTF-8 on stdout - a
+# piped stdout on Windows otherwise defaults to the ANSI codepage
+if hasattr(sys.stdout, 'reconfigure'):
+    sys.stdout.reconfigure(encoding='utf-8')
+
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj).decode()
+
+    _loads = orjson.loads
+except ImportError:
+    # orjson is an optional speedup; stdlib json works the same
+    _dumps = json.dumps
+    _loads = json.loads
 
 try:
     import pyttsx3
@@ -13,63 +34,229 @@ except ImportError:
     print("ERROR: pyttsx3 not installed. Run: pip install pyttsx3", file=sys.stderr)
     sys.exit(1)
 
+# Cached engine state - pyttsx3.init() does COM/dbus setup and is far more
+# expensive than synthesis itself, so initialize once and reuse
+_ENGINE = None
+_VOICES = None
+_DEFAULT_RATE = None
+_LAST_APPLIED = None  # (voice_id, rate, volume) last pushed to the engine
+
+# Content-addressed cache for synthesized audio - wellness prompts repeat
+# a lot (affirmations, breathing guides), so identical requests become a
+# file link instead of a synthesis run
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         '..', 'temp', 'tts_cache')
+
+def _cache_path(text, language, slow, gender):
+    """
+    Cache file path for a (text, language, slow, gender) combination.
+    blake2b is noticeably faster than SHA-2 for these input sizes.
+    """
+    key = hashlib.blake2b(f"{text}|{language}|{slow}|{gender}".encode('utf-8'),
+                          digest_size=16).hexdigest()
+    return os.path.join(CACHE_DIR, key + '.mp3')
+
+def _deliver(cached, output_file):
+    """
+    Copy a cached audio file to its destination (hardlink when possible)
+    """
+    output_dir = os.path.dirname(output_file)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    try:
+        os.link(cached, output_file)
+    except OSError:
+        # Already delivered (destination is a link of the cache file) -
+        # nothing to do; otherwise fall back to a plain copy
+        if os.path.exists(output_file) and os.path.samefile(cached, output_file):
+            return
+        shutil.copyfile(cached, output_file)
+
+def _get_engine():
+    """
+    Lazily initialize the shared pyttsx3 engine and cache its voice list
+    """
+    global _ENGINE, _VOICES, _DEFAULT_RATE
+    if _ENGINE is None:
+        _ENGINE = pyttsx3.init()
+        _VOICES = _ENGINE.getProperty('voices')
+        _DEFAULT_RATE = _ENGINE.getProperty('rate')
+    return _ENGINE
+
+def _apply_settings(engine, gender, slow):
+    """
+    Queue voice/rate/volume properties for the next utterance, skipping
+    the setProperty calls when nothing changed since the previous one
+    """
+    global _LAST_APPLIED
+    voices = _VOICES
+
+    # Select voice based on gender
+    # Windows typically has:
+    # - voices[0] = Male voice
+    # - voices[1] = Female voice (if available)
+
+    voice_id = None
+    if gender == 'male':
+        # Use first voice (usually male on Windows)
+        if len(voices) > 0:
+            voice_id = voices[0].id
+    else:  # female
+        # Try to use second voice if available, otherwise use first
+        if len(voices) > 1:
+            voice_id = voices[1].id
+        elif len(voices) > 0:
+            voice_id = voices[0].id
+
+    # Set speech rate (relative to the engine default, not the
+    # previous call, so reuse doesn't drift the rate downward)
+    rate = _DEFAULT_RATE
+    if slow:
+        rate = _DEFAULT_RATE - 50  # Slower
+    elif gender == 'male':
+        rate = _DEFAULT_RATE - 20  # Slightly slower for male
+
+    # Volume (0.0 to 1.0)
+    volume = 0.9
+
+    wanted = (voice_id, rate, volume)
+    if wanted != _LAST_APPLIED:
+        if voice_id is not None:
+            engine.setProperty('voice', voice_id)
+        engine.setProperty('rate', rate)
+        engine.setProperty('volume', volume)
+        _LAST_APPLIED = wanted
+
 def generate_tts(text, output_file, language='en', slow=False, gender='female'):
     """
     Generate TTS audio file using pyttsx3 (offline engine)
     """
     try:
-        # Initialize TTS engine
-        engine = pyttsx3.init()
-        
-        # Get available voices
-        voices = engine.getProperty('voices')
-        
-        # Select voice based on gender
-        # Windows typically has:
-        # - voices[0] = Male voice
-        # - voices[1] = Female voice (if available)
-        
-        if gender == 'male':
-            # Use first voice (usually male on Windows)
-            if len(voices) > 0:
-                engine.setProperty('voice', voices[0].id)
-        else:  # female
-            # Try to use second voice if available, otherwise use first
-            if len(voices) > 1:
-                engine.setProperty('voice', voices[1].id)
-            elif len(voices) > 0:
-                engine.setProperty('voice', voices[0].id)
-        
-        # Set speech rate
-        rate = engine.getProperty('rate')
-        if slow:
-            engine.setProperty('rate', rate - 50)  # Slower
-        elif gender == 'male':
-            engine.setProperty('rate', rate - 20)  # Slightly slower for male
-        
-        # Set volume (0.0 to 1.0)
-        engine.setProperty('volume', 0.9)
-        
-        # Ensure output directory exists
-        output_dir = os.path.dirname(output_file)
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir, exist_ok=True)
-        
-        # Save to file
-        engine.save_to_file(text, output_file)
+        # Serve repeated phrases straight from the cache
+        cached = _cache_path(text, language, slow, gender)
+        if os.path.exists(cached):
+            _deliver(cached, output_file)
+            return True
+
+        engine = _get_engine()
+        _apply_settings(engine, gender, slow)
+
+        # Synthesize to a temp path and rename into the cache only once
+        # the engine run completes, so an interrupted synthesis can never
+        # leave a truncated file behind as a permanent cache hit
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = cached + '.tmp'
+        engine.save_to_file(text, tmp)
         engine.runAndWait()
-        
-        print(f"SUCCESS: Audio saved to {output_file}")
+        os.rename(tmp, cached)
+        _deliver(cached, output_file)
+
         return True
         
     except Exception as e:
         print(f"ERROR: {str(e)}", file=sys.stderr)
         return False
 
+def generate_tts_batch(items):
+    """
+    Generate several TTS files in a single engine run.
+
+    items is a list of dicts with keys: text, output_file, and optional
+    slow/gender. All utterances are queued on the shared engine and the
+    event loop runs once, instead of paying one runAndWait() round-trip
+    per file. Returns a list of success booleans, one per item.
+    """
+    if len(items) == 1:
+        # Single item - no point paying the batch bookkeeping
+        item = items[0]
+        return [generate_tts(
+            item['text'], item['output_file'],
+            item.get('language', 'en'),
+            item.get('slow', False),
+            item.get('gender', 'female')
+        )]
+
+    results = [False] * len(items)
+    try:
+        # Cache hits need no engine, so only initialize it (and the cache
+        # directory) on the first miss - mirrors generate_tts's order
+        engine = None
+        pending = []
+        queued = set()
+        for i, item in enumerate(items):
+            cached = _cache_path(item['text'], item.get('language', 'en'),
+                                 item.get('slow', False),
+                                 item.get('gender', 'female'))
+            if os.path.exists(cached):
+                _deliver(cached, item['output_file'])
+                results[i] = True
+                continue
+            if engine is None:
+                engine = _get_engine()
+                os.makedirs(CACHE_DIR, exist_ok=True)
+            # Duplicate texts in one batch share a cache entry - queue
+            # the synthesis once and deliver to every output path
+            if cached not in queued:
+                queued.add(cached)
+                _apply_settings(engine, item.get('gender', 'female'),
+                                item.get('slow', False))
+                engine.save_to_file(item['text'], cached + '.tmp')
+            pending.append((i, cached, item['output_file']))
+        if pending:
+            engine.runAndWait()
+            for i, cached, output_file in pending:
+                if os.path.exists(cached + '.tmp'):
+                    os.rename(cached + '.tmp', cached)
+                if os.path.exists(cached):
+                    _deliver(cached, output_file)
+                    results[i] = True
+    except Exception as e:
+        print(f"ERROR: {str(e)}", file=sys.stderr)
+
+    return results
+
+def run_server():
+    """
+    JSON-line server mode: one {"text", "output_file", "language", "slow",
+    "gender"} request per stdin line, one JSON response per stdout line.
+    Lets the backend keep a single worker process alive instead of paying
+    interpreter startup and engine init per utterance.
+    """
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = _loads(line)
+            text = request.get('text', '')
+            output_file = request.get('output_file', '')
+            gender = request.get('gender', 'female')
+            if gender not in ['male', 'female']:
+                gender = 'female'
+            if not text or len(text.strip()) == 0 or not output_file:
+                response = {"success": False,
+                            "error": "Empty text or output file"}
+            else:
+                success = generate_tts(
+                    text, output_file,
+                    request.get('language', 'en'),
+                    bool(request.get('slow', False)),
+                    gender
+                )
+                response = {"success": success, "output_file": output_file}
+        except Exception as e:
+            response = {"success": False, "error": str(e)}
+        sys.stdout.write(_dumps(response) + '\n')
+        sys.stdout.flush()
+
 def main():
     """
     Main function - accepts command line arguments
     """
+    if len(sys.argv) > 1 and sys.argv[1] == '--server':
+        run_server()
+        return
+
     if len(sys.argv) < 3:
         print("Usage: python tts_generator.py <text> <output_file> [language] [slow] [gender]", file=sys.stderr)
         sys.exit(1)
@@ -89,7 +276,9 @@ def main():
         sys.exit(1)
     
     success = generate_tts(text, output_file, language, slow, gender)
-    
+
+    if success:
+        print(f"SUCCESS: Audio saved to {output_file}")
     sys.exit(0 if success else 1)
 
 if __name__ == "__main__":
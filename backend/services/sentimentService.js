@@ -10,53 +10,118 @@ const { getHybridSentiment } = require('./aiSentimentService');
 const PYTHON_PATH = process.env.PYTHON_PATH || 'python3';
 const SENTIMENT_SCRIPT = path.join(__dirname, '../python/sentiment_analyzer.py');
 
+// Persistent worker state - one Python process serves all requests over a
+// JSON-line pipe, so interpreter + VADER import startup is paid once.
+// Holds { process, pending }: the queue lives with its worker generation
+// so a dying worker can only consume and reject its own requests.
+let sentimentWorker = null;
+
+/**
+ * Reject everything still queued on a worker (it died or timed out)
+ */
+function rejectAllPending(pending, error) {
+  pending.splice(0).forEach((entry) => entry.reject(error));
+}
+
+/**
+ * Get (or lazily spawn) the persistent sentiment worker
+ */
+function getSentimentWorker() {
+  if (sentimentWorker) {
+    return sentimentWorker;
+  }
+
+  const proc = spawn(PYTHON_PATH, [SENTIMENT_SCRIPT, '--server']);
+  const pending = [];
+  const worker = { process: proc, pending };
+  let buffer = '';
+
+  // Responses come back one JSON line per request, in request order
+  proc.stdout.on('data', (data) => {
+    buffer += data.toString();
+    let newlineIndex;
+    while ((newlineIndex = buffer.indexOf('\n')) !== -1) {
+      const line = buffer.slice(0, newlineIndex).trim();
+      buffer = buffer.slice(newlineIndex + 1);
+
+      const entry = pending.shift();
+      if (!entry) continue;
+
+      try {
+        const sentiment = JSON.parse(line);
+        if (sentiment.error) {
+          entry.reject(new Error(sentiment.error));
+        } else {
+          entry.resolve(sentiment);
+        }
+      } catch (error) {
+        console.error('Failed to parse sentiment output:', line);
+        entry.reject(new Error('Failed to parse sentiment analysis result'));
+      }
+    }
+  });
+
+  proc.stderr.on('data', (data) => {
+    console.error('Sentiment worker stderr:', data.toString());
+  });
+
+  // A write can race worker death (timeout kill, crash before 'close'
+  // fires); without a handler that stream error would crash the whole
+  // process. The 'close' handler rejects whatever is still pending.
+  proc.stdin.on('error', (error) => {
+    console.error('Sentiment worker stdin error:', error.message);
+  });
+
+  // Only clear the module reference if it still points at this worker -
+  // a late 'close' from a killed worker must not clobber its replacement
+  proc.on('close', (code) => {
+    if (sentimentWorker === worker) {
+      sentimentWorker = null;
+    }
+    rejectAllPending(pending, new Error(`Sentiment analysis failed with code ${code}`));
+  });
+
+  proc.on('error', (error) => {
+    if (sentimentWorker === worker) {
+      sentimentWorker = null;
+    }
+    rejectAllPending(pending, new Error(`Failed to start sentiment analysis: ${error.message}`));
+  });
+
+  sentimentWorker = worker;
+  return worker;
+}
+
 /**
  * Analyze sentiment using VADER (Python)
  */
 async function analyzeSentiment(text) {
   return new Promise((resolve, reject) => {
-    // Spawn Python process
-    const pythonProcess = spawn(PYTHON_PATH, [SENTIMENT_SCRIPT, text]);
-    
-    let outputData = '';
-    let errorData = '';
-    
-    // Collect stdout
-    pythonProcess.stdout.on('data', (data) => {
-      outputData += data.toString();
-    });
-    
-    // Collect stderr
-    pythonProcess.stderr.on('data', (data) => {
-      errorData += data.toString();
-    });
-    
-    // Handle process completion
-    pythonProcess.on('close', (code) => {
-      if (code === 0) {
-        try {
-          const sentiment = JSON.parse(outputData.trim());
-          resolve(sentiment);
-        } catch (error) {
-          console.error('Failed to parse sentiment output:', outputData);
-          reject(new Error('Failed to parse sentiment analysis result'));
-        }
-      } else {
-        console.error('Sentiment analysis error:', errorData);
-        reject(new Error(`Sentiment analysis failed with code ${code}`));
+    const worker = getSentimentWorker();
+
+    // Set timeout (5 seconds). Responses are matched to requests by
+    // order, so a stuck request invalidates the worker - kill it and
+    // let the next call respawn a fresh one
+    const timer = setTimeout(() => {
+      worker.process.kill();
+      if (sentimentWorker === worker) {
+        sentimentWorker = null;
       }
-    });
-    
-    // Handle process errors
-    pythonProcess.on('error', (error) => {
-      reject(new Error(`Failed to start sentiment analysis: ${error.message}`));
-    });
-    
-    // Set timeout (5 seconds)
-    setTimeout(() => {
-      pythonProcess.kill();
-      reject(new Error('Sentiment analysis timeout'));
+      rejectAllPending(worker.pending, new Error('Sentiment analysis timeout'));
     }, 5000);
+
+    worker.pending.push({
+      resolve: (value) => {
+        clearTimeout(timer);
+        resolve(value);
+      },
+      reject: (error) => {
+        clearTimeout(timer);
+        reject(error);
+      }
+    });
+
+    worker.process.stdin.write(JSON.stringify({ text }) + '\n');
   });
 }
 
@@ -16,8 +16,85 @@ if (!fs.existsSync(AUDIO_DIR)) {
 }
 
 
+// Persistent worker state - one Python process serves all requests over a
+// JSON-line pipe, so interpreter startup and TTS engine init are paid once.
+// Holds { process, pending }: the queue lives with its worker generation
+// so a dying worker can only consume and reject its own requests.
+let ttsWorker = null;
+
+/**
+ * Reject everything still queued on a worker (it died or timed out)
+ */
+function rejectAllPending(pending, error) {
+    pending.splice(0).forEach((entry) => entry.reject(error));
+}
+
 /**
- * Generate audio file from text using gTTS
+ * Get (or lazily spawn) the persistent TTS worker
+ */
+function getTTSWorker() {
+    if (ttsWorker) {
+        return ttsWorker;
+    }
+
+    const proc = spawn(PYTHON_PATH, [TTS_SCRIPT, '--server']);
+    const pending = [];
+    const worker = { process: proc, pending };
+    let buffer = '';
+
+    // Responses come back one JSON line per request, in request order
+    proc.stdout.on('data', (data) => {
+        buffer += data.toString();
+        let newlineIndex;
+        while ((newlineIndex = buffer.indexOf('\n')) !== -1) {
+            const line = buffer.slice(0, newlineIndex).trim();
+            buffer = buffer.slice(newlineIndex + 1);
+
+            const entry = pending.shift();
+            if (!entry) continue;
+
+            try {
+                entry.resolve(JSON.parse(line));
+            } catch (error) {
+                console.error('Failed to parse TTS output:', line);
+                entry.reject(new Error('Failed to parse TTS result'));
+            }
+        }
+    });
+
+    proc.stderr.on('data', (data) => {
+        console.error('TTS worker stderr:', data.toString());
+    });
+
+    // A write can race worker death (timeout kill, crash before 'close'
+    // fires); without a handler that stream error would crash the whole
+    // process. The 'close' handler rejects whatever is still pending.
+    proc.stdin.on('error', (error) => {
+        console.error('TTS worker stdin error:', error.message);
+    });
+
+    // Only clear the module reference if it still points at this worker -
+    // a late 'close' from a killed worker must not clobber its replacement
+    proc.on('close', (code) => {
+        if (ttsWorker === worker) {
+            ttsWorker = null;
+        }
+        rejectAllPending(pending, new Error(`TTS generation failed with code ${code}`));
+    });
+
+    proc.on('error', (error) => {
+        if (ttsWorker === worker) {
+            ttsWorker = null;
+        }
+        rejectAllPending(pending, new Error(`Failed to start TTS process: ${error.message}`));
+    });
+
+    ttsWorker = worker;
+    return worker;
+}
+
+/**
+ * Generate audio file from text
  */
 async function generateVoice(text, language = 'en', slow = false, gender = 'female') {
     return new Promise((resolve, reject) => {
@@ -25,56 +102,51 @@ async function generateVoice(text, language = 'en', slow = false, gender = 'fema
         const randomId = Math.random().toString(36).substring(7);
         const filename = `tts_${timestamp}_${randomId}.mp3`;
         const outputPath = path.join(AUDIO_DIR, filename);
-        
+
         // Validate gender parameter
         const validGender = ['male', 'female'].includes(gender) ? gender : 'female';
-        
-        // Spawn Python process with gender parameter
-        const pythonArgs = [
-            TTS_SCRIPT, 
-            text, 
-            outputPath, 
-            language, 
-            slow ? 'true' : 'false',
-            validGender  // ✅ NEW: Pass gender to Python
-        ];
-        
-        const pythonProcess = spawn(PYTHON_PATH, pythonArgs);
-        
-        let outputData = '';
-        let errorData = '';
-        
-        pythonProcess.stdout.on('data', (data) => {
-            outputData += data.toString();
-        });
-        
-        pythonProcess.stderr.on('data', (data) => {
-            errorData += data.toString();
-        });
-        
-        pythonProcess.on('close', (code) => {
-            if (code === 0 && fs.existsSync(outputPath)) {
-                // Schedule cleanup after 10 minutes
-                setTimeout(() => {
-                    cleanupAudioFile(outputPath);
-                }, 10 * 60 * 1000);
-                
-                resolve(filename);
-            } else {
-                console.error('TTS generation failed:', errorData);
-                reject(new Error(`TTS generation failed with code ${code}`));
+
+        const worker = getTTSWorker();
+
+        // Set timeout (15 seconds). Responses are matched to requests by
+        // order, so a stuck request invalidates the worker - kill it and
+        // let the next call respawn a fresh one
+        const timer = setTimeout(() => {
+            worker.process.kill();
+            if (ttsWorker === worker) {
+                ttsWorker = null;
+            }
+            rejectAllPending(worker.pending, new Error('TTS generation timeout'));
+        }, 15000);
+
+        worker.pending.push({
+            resolve: (result) => {
+                clearTimeout(timer);
+                if (result.success && fs.existsSync(outputPath)) {
+                    // Schedule cleanup after 10 minutes
+                    setTimeout(() => {
+                        cleanupAudioFile(outputPath);
+                    }, 10 * 60 * 1000);
+
+                    resolve(filename);
+                } else {
+                    console.error('TTS generation failed:', result.error || result);
+                    reject(new Error('TTS generation failed'));
+                }
+            },
+            reject: (error) => {
+                clearTimeout(timer);
+                reject(error);
             }
         });
-        
-        pythonProcess.on('error', (error) => {
-            reject(new Error(`Failed to start TTS process: ${error.message}`));
-        });
-        
-        // Set timeout
-        setTimeout(() => {
-            pythonProcess.kill();
-            reject(new Error('TTS generation timeout'));
-        }, 15000); // 15 second timeout
+
+        worker.process.stdin.write(JSON.stringify({
+            text,
+            output_file: outputPath,
+            language,
+            slow,
+            gender: validGender
+        }) + '\n');
     });
 }
 